@@ -2,86 +2,90 @@
 
 # These are built-in libraries that help us do important stuff:
 import argparse         # lets us read values like --ticker AAPL from the command line
+import functools        # lets us remember (cache) results of slow function calls
 import importlib        # helps us load the strategy file chosen by the user
+import itertools        # builds every ticker/strategy combination for run_many
+import os               # tells us how many CPU cores we can use
+from datetime import date  # keys the in-memory price cache by day, like the disk cache
+from concurrent.futures import ProcessPoolExecutor  # runs backtests side by side
 import pandas as pd     # used for working with tables (like Excel in Python)
 import numpy as np      # used for math stuff
 import matplotlib.pyplot as plt  # used for plotting graphs
 from scipy import stats
 
+# polars is optional: when installed it speeds up calculate_monthly_returns
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 # We import our custom function from the utils folder
 from utils import get_data
+from utils.arrays import to_arrays
+from strategies._loops import _backtest_loop
 
 # -----------------------------------------------------
 # This function calculates all the stats like return, Sharpe ratio, etc.
 # -----------------------------------------------------
 def calculate_metrics(df):
     """Calculate comprehensive trading performance metrics."""
-    # Check if we have any signal changes
-    signal_changes = df["Signal"].diff().fillna(0)
-    entries = signal_changes[signal_changes == 1].index
-    exits = signal_changes[signal_changes == -2].index
+    # The compiled kernel pairs each sell with the buy it closes
+    # (a trailing buy without a sell is an open position and is ignored)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    dates = df["Date"].to_numpy()
+    _, buys, sells = _backtest_loop(close, df["Signal"].to_numpy(dtype=np.int8), 1.0)
     
-    if len(entries) == 0 or len(exits) == 0:
+    if len(buys) == 0:
         print("⚠️ No trades executed.")
         return None
 
+    # Work on the raw equity array; only Drawdown is kept on df (the plots use it).
+    # float32 is plenty for an equity curve and halves the memory traffic below.
+    equity = df["EquityCurve"].to_numpy(dtype=np.float32, copy=False)
+    
     # Calculate total return from equity curve
-    start_equity = df["EquityCurve"].iloc[0]
-    end_equity = df["EquityCurve"].iloc[-1]
+    start_equity = equity[0]
+    end_equity = equity[-1]
     total_return = (end_equity / start_equity) - 1
     
     # Calculate trade stats
     num_years = (df["Date"].iloc[-1] - df["Date"].iloc[0]).days / 365
     cagr = (1 + total_return) ** (1 / num_years) - 1
     
-    # Calculate Sharpe Ratio (daily returns)
-    df["Daily_Return"] = df["EquityCurve"].pct_change().fillna(0)
-    avg_daily_return = df["Daily_Return"].mean()
-    daily_std = df["Daily_Return"].std()
+    # Calculate Sharpe Ratio (daily returns, first day counts as 0)
+    daily_returns = np.zeros(len(equity), dtype=np.float32)
+    daily_returns[1:] = np.diff(equity) / equity[:-1]
+    avg_daily_return = daily_returns.mean()
+    daily_std = daily_returns.std(ddof=1)
     sharpe_ratio = np.sqrt(252) * avg_daily_return / daily_std
     
     # Calculate max drawdown
-    df["Peak"] = df["EquityCurve"].cummax()
-    df["Drawdown"] = (df["EquityCurve"] - df["Peak"]) / df["Peak"]
-    max_drawdown = df["Drawdown"].min()
+    peak = np.maximum.accumulate(equity)
+    drawdown = (equity - peak) / peak
+    max_drawdown = drawdown.min()
+    df["Drawdown"] = drawdown
     
     # Calculate win rate and profit factor
-    trades = []
-    position = 0
-    entry_price = 0
-    entry_date = None
-    
-    for i in range(len(df)):
-        if df["Signal"].iloc[i] == 1 and position == 0:
-            position = 1
-            entry_price = df["Close"].iloc[i]
-            entry_date = df["Date"].iloc[i]
-        elif df["Signal"].iloc[i] == -1 and position == 1:
-            position = 0
-            exit_price = df["Close"].iloc[i]
-            exit_date = df["Date"].iloc[i]
-            trades.append({
-                "Entry Date": entry_date,
-                "Exit Date": exit_date,
-                "Entry Price": entry_price,
-                "Exit Price": exit_price,
-                "Return %": (exit_price - entry_price) / entry_price * 100
-            })
-    
-    trades_df = pd.DataFrame(trades)
-    if len(trades_df) == 0:
-        print("⚠️ No complete trades found.")
-        return None
+    trades_df = pd.DataFrame({
+        "Entry Date": dates[buys],
+        "Exit Date": dates[sells],
+        "Entry Price": close[buys],
+        "Exit Price": close[sells],
+    })
+    trades_df["Return %"] = (trades_df["Exit Price"] - trades_df["Entry Price"]) / trades_df["Entry Price"] * 100
         
-    win_rate = (trades_df["Return %"] > 0).mean()
-    profits = trades_df[trades_df["Return %"] > 0]["Return %"].sum()
-    losses = abs(trades_df[trades_df["Return %"] < 0]["Return %"].sum())
+    returns = trades_df["Return %"].to_numpy()
+    wins = returns[returns > 0]
+    losing = returns[returns < 0]
+    win_rate = len(wins) / len(returns)
+    profits = wins.sum()
+    losses = abs(losing.sum())
     profit_factor = profits / losses if losses != 0 else float('inf')
     
     # Calculate average trade metrics
-    avg_trade = trades_df["Return %"].mean()
-    avg_win = trades_df[trades_df["Return %"] > 0]["Return %"].mean() if len(trades_df[trades_df["Return %"] > 0]) > 0 else 0
-    avg_loss = trades_df[trades_df["Return %"] < 0]["Return %"].mean() if len(trades_df[trades_df["Return %"] < 0]) > 0 else 0
+    avg_trade = returns.mean()
+    avg_win = wins.mean() if len(wins) > 0 else 0
+    avg_loss = losing.mean() if len(losing) > 0 else 0
     
     # Print results
     metrics = {
@@ -127,16 +131,16 @@ def plot_equity_curve(df):
     buys  = df.loc[buy_mask,  ["Date", "EquityCurve"]]
     sells = df.loc[sell_mask, ["Date", "EquityCurve"]]
 
-    # Scatter buys & sells
+    # Mark buys & sells (marker-only lines draw much faster than scatter collections)
     if not buys.empty:
-        ax1.scatter(
+        ax1.plot(
             buys["Date"], buys["EquityCurve"],
-            marker="^", color="green", s=100, label="Buy"
+            linestyle="none", marker="^", color="green", markersize=10, label="Buy"
         )
     if not sells.empty:
-        ax1.scatter(
+        ax1.plot(
             sells["Date"], sells["EquityCurve"],
-            marker="v", color="red", s=100, label="Sell"
+            linestyle="none", marker="v", color="red", markersize=10, label="Sell"
         )
 
     ax1.set_title("Equity Curve")
@@ -154,9 +158,10 @@ def plot_equity_curve(df):
     labels = ["Equity Curve", "Buy", "Sell"]
     ax1.legend(handles, labels)
 
-    # -- Plot drawdown --
-    df["Peak"]     = df["EquityCurve"].cummax()
-    df["Drawdown"] = (df["EquityCurve"] - df["Peak"]) / df["Peak"]
+    # -- Plot drawdown (already filled in when df came through calculate_metrics) --
+    if "Drawdown" not in df.columns:
+        df["Peak"]     = df["EquityCurve"].cummax()
+        df["Drawdown"] = (df["EquityCurve"] - df["Peak"]) / df["Peak"]
     ax2.fill_between(df["Date"], df["Drawdown"], 0, color="red", alpha=0.3)
 
     ax2.set_title("Drawdown")
@@ -168,20 +173,51 @@ def plot_equity_curve(df):
     plt.show()
 
 
+# -----------------------------------------------------
+# Strategy modules and price data are loaded once and reused on later runs
+# -----------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _load_strategy(name):
+    """Import strategies.<name>, caching the module for repeated backtests."""
+    return importlib.import_module(f"strategies.{name}")
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_prices(ticker, day):
+    return get_data.get_data(ticker)
+
+
+def _load_prices(ticker):
+    """
+    Price data for ticker, downloaded (or read from the disk cache) once per day.
+    Returns a copy so callers can't change the cached frame.
+    """
+    # Keyed on today's date so a long-running process picks up the next day's data,
+    # just like the disk cache in utils/get_data.py
+    return _cached_prices(ticker, date.today()).copy()
+
+
 # -----------------------------------------------------
 # This is the main function that runs everything
 # -----------------------------------------------------
-def main(ticker, strategy_name):
+def main(ticker, strategy_name, use_cache=True, plot=True):
     """Main backtesting function."""
     print(f"🔍 Getting {ticker} data...")
     
     # Get price data
-    df = get_data.get_data(ticker)
+    if use_cache:
+        df = _load_prices(ticker)
+    else:
+        df = get_data.get_data(ticker, use_cache=False)
+        # Drop the memoized frames so later cached runs see the fresh download
+        _cached_prices.cache_clear()
     
     # Load and run strategy
     print(f"📊 Applying strategy: {strategy_name}")
-    strategy_module = importlib.import_module(f"strategies.{strategy_name}")
-    strategy_df = strategy_module.generate_signals(df.copy())
+    strategy_module = _load_strategy(strategy_name)
+    # Pull out the OHLCV arrays once; strategies compute on these instead of the DataFrame
+    arrs = to_arrays(df)
+    strategy_df = strategy_module.generate_signals(df, arrs)
     
     # Calculate and display metrics
     result = calculate_metrics(strategy_df)
@@ -193,28 +229,89 @@ def main(ticker, strategy_name):
     metrics, trades_df = result
     
     # Plot results
-    plot_equity_curve(strategy_df)
+    if plot:
+        plot_equity_curve(strategy_df)
 
     
     
     return metrics, trades_df, strategy_df
-def calculate_monthly_returns(strategy_df):
-    """Generate a DataFrame of monthly returns with Year, Jan-Dec, StratReturns, and bh_returns."""
+
+# -----------------------------------------------------
+# This runs many backtests at once, one per CPU core
+# -----------------------------------------------------
+def run_many(tickers, strategies, use_cache=True, max_workers=None):
+    """
+    Run every ticker/strategy combination in parallel worker processes.
+    Returns a dict mapping (ticker, strategy_name) to the result of main.
+    """
+    # Download each ticker once up front; the workers then read it from the disk cache
+    for ticker in tickers:
+        get_data.get_data(ticker, use_cache=use_cache)
+    
+    combos = list(itertools.product(tickers, strategies))
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {combo: executor.submit(main, *combo, plot=False) for combo in combos}
+        return {combo: future.result() for combo, future in futures.items()}
+
+MONTH_ABBR = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def _monthly_returns_pandas(strategy_df):
+    """Strategy and buy & hold monthly returns with pandas, as (Year x Month) tables."""
     df = strategy_df.copy()
     df["Year"] = df["Date"].dt.year
     df["Month"] = df["Date"].dt.month
 
+    # Compound daily returns within each month as expm1(sum(log1p(r))), so the
+    # grouping runs on the built-in sum instead of a Python lambda per group
+
     # Strategy monthly returns
-    df["Daily_Return"] = df["EquityCurve"].pct_change()
-    monthly_returns = df.groupby(["Year", "Month"])["Daily_Return"].apply(lambda x: (x + 1).prod() - 1).unstack()
+    df["Log_Return"] = np.log1p(df["EquityCurve"].pct_change())
+    monthly_returns = np.expm1(df.groupby(["Year", "Month"])["Log_Return"].sum()).unstack()
 
     # Buy and hold monthly returns
-    df["BH_Daily"] = df["Close"].pct_change()
-    bh_returns = df.groupby(["Year", "Month"])["BH_Daily"].apply(lambda x: (x + 1).prod() - 1).unstack()
+    df["BH_Log_Return"] = np.log1p(df["Close"].pct_change())
+    bh_returns = np.expm1(df.groupby(["Year", "Month"])["BH_Log_Return"].sum()).unstack()
+    return monthly_returns, bh_returns
+
+def _monthly_returns_polars(strategy_df):
+    """Same as _monthly_returns_pandas, with the group-by running multi-threaded in polars."""
+    monthly = (
+        pl.from_pandas(strategy_df[["Date", "EquityCurve", "Close"]])
+        # Daily returns over the whole series first, so each month's first day
+        # is measured against the previous month's last bar
+        .with_columns(
+            pl.col("Date").dt.year().alias("Year"),
+            pl.col("Date").dt.month().alias("Month"),
+            (pl.col("EquityCurve").pct_change() + 1).alias("Strategy"),
+            (pl.col("Close").pct_change() + 1).alias("BuyHold"),
+        )
+        .group_by(["Year", "Month"])
+        .agg(pl.col("Strategy").product() - 1, pl.col("BuyHold").product() - 1)
+        .to_pandas()
+        .set_index(["Year", "Month"])
+        .sort_index()
+    )
+    return monthly["Strategy"].unstack(), monthly["BuyHold"].unstack()
+
+def calculate_monthly_returns(strategy_df, engine=None):
+    """
+    Generate a DataFrame of monthly returns with Year, Jan-Dec, StratReturns, and bh_returns.
+    engine can be "polars" or "pandas"; by default polars is used when it is installed.
+    """
+    if engine is None:
+        engine = "polars" if pl is not None else "pandas"
+    if engine == "polars":
+        if pl is None:
+            raise ImportError("engine='polars' requires the polars package")
+        monthly_returns, bh_returns = _monthly_returns_polars(strategy_df)
+    elif engine == "pandas":
+        monthly_returns, bh_returns = _monthly_returns_pandas(strategy_df)
+    else:
+        raise ValueError(f"Unknown engine {engine!r}; use 'pandas' or 'polars'")
 
     # Format month columns
-    monthly_returns.columns = [pd.to_datetime(str(m), format="%m").strftime("%b") for m in monthly_returns.columns]
-    bh_returns.columns = [pd.to_datetime(str(m), format="%m").strftime("%b") for m in bh_returns.columns]
+    monthly_returns.columns = [MONTH_ABBR[m - 1] for m in monthly_returns.columns]
+    bh_returns.columns = [MONTH_ABBR[m - 1] for m in bh_returns.columns]
 
     monthly_returns["StratReturns"] = monthly_returns.sum(axis=1)
     bh_returns["bh_returns"] = bh_returns.sum(axis=1)
@@ -228,10 +325,14 @@ def calculate_monthly_returns(strategy_df):
 # -----------------------------------------------------
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run backtest on any ticker with any strategy.")
-    parser.add_argument("--ticker", type=str, required=True, help="Ticker symbol (e.g., SPY, AAPL, TSLA)")
-    parser.add_argument("--strategy", type=str, required=True, help="Strategy name without .py (e.g., strategy1)")
+    parser.add_argument("--ticker", type=str, nargs="+", required=True, help="Ticker symbol(s) (e.g., SPY, AAPL, TSLA)")
+    parser.add_argument("--strategy", type=str, nargs="+", required=True, help="Strategy name(s) without .py (e.g., strategy1)")
+    parser.add_argument("--no-cache", action="store_true", help="Download fresh data instead of reusing today's cached copy")
     args = parser.parse_args()
-    main(args.ticker, args.strategy)
+    if len(args.ticker) == 1 and len(args.strategy) == 1:
+        main(args.ticker[0], args.strategy[0], use_cache=not args.no_cache)
+    else:
+        run_many(args.ticker, args.strategy, use_cache=not args.no_cache)
 
 
    
\ No newline at end of file
@@ -1,6 +1,11 @@
+import contextlib
+import io
+import itertools
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import numpy as np
 import importlib
 
 # Add the parent directory to sys.path
@@ -19,33 +24,31 @@ def check_signal_integrity(strategy_df):
     issues = []
     
     # Get signal values
-    signals = strategy_df['Signal'].values
-    dates = strategy_df['Date'].values
+    signals = strategy_df['Signal'].to_numpy()
+    dates = strategy_df['Date'].to_numpy()
     
-    # Check for consecutive buy signals (1)
-    last_signal = 0
-    for i in range(len(signals)):
-        if signals[i] == 1:  # Buy signal
-            if last_signal == 1:
-                issues.append(f"Consecutive buy signals at {dates[i]}")
-            last_signal = 1
-        elif signals[i] == -1:  # Sell signal
-            if last_signal == -1:
-                issues.append(f"Consecutive sell signals at {dates[i]}")
-            last_signal = -1
+    # Compare every buy/sell signal with the previous one: a repeat means two
+    # buys (or two sells) without the opposite signal in between
+    signal_idx = np.flatnonzero((signals == 1) | (signals == -1))
+    repeats = signal_idx[1:][np.diff(signals[signal_idx]) == 0]
+    for i in repeats:
+        if signals[i] == 1:
+            issues.append(f"Consecutive buy signals at {dates[i]}")
+        else:
+            issues.append(f"Consecutive sell signals at {dates[i]}")
     
     # Count total buy and sell signals
-    buy_count = sum(signals == 1)
-    sell_count = sum(signals == -1)
+    buy_count = np.count_nonzero(signals == 1)
+    sell_count = np.count_nonzero(signals == -1)
     
     if buy_count != sell_count and buy_count != sell_count + 1:
         issues.append(f"Unbalanced signals: {buy_count} buys, {sell_count} sells")
     
     return len(issues) == 0, issues
 
-def debug_strategy(ticker, strategy_name):
+def debug_strategy(ticker, strategy_name, plot=True):
     """Run backtest and debug signal integrity"""
-    result = backtest.main(ticker, strategy_name)
+    result = backtest.main(ticker, strategy_name, plot=plot)
     
     if result is None or len(result) < 3:
         print(f"No valid results for {ticker} using {strategy_name}")
@@ -64,16 +67,25 @@ def debug_strategy(ticker, strategy_name):
         print("Signal integrity check: PASSED")
     else:
         print("Signal integrity check: FAILED")
-        for issue in issues:
-            print(f"  - {issue}")
+        sys.stdout.write("\n".join(f"  - {issue}" for issue in issues) + "\n")
     
     return strategy_df
 
+def _debug_report(ticker, strategy_name):
+    """Run debug_strategy without plotting and return everything it printed."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        debug_strategy(ticker, strategy_name, plot=False)
+    return out.getvalue()
+
 if __name__ == "__main__":
     # Test all strategies with SPY
     ticker = "SPY"
-    for i in range(1, 6):
-        strategy_name = f"strategy{i}"
-        print(f"\n{'='*50}")
-        df = debug_strategy(ticker, strategy_name)
-        print(f"{'='*50}\n") 
\ No newline at end of file
+    # Load the prices once up front; this also fills the disk cache the workers read from
+    backtest._load_prices(ticker)
+    strategy_names = [f"strategy{i}" for i in range(1, 6)]
+    # Each strategy runs in its own process; the reports are printed in order once all are done
+    with ProcessPoolExecutor(max_workers=min(len(strategy_names), os.cpu_count() or 1)) as ex:
+        reports = list(ex.map(_debug_report, itertools.repeat(ticker), strategy_names))
+    separator = "=" * 50
+    sys.stdout.write("".join(f"\n{separator}\n{report}{separator}\n\n" for report in reports))
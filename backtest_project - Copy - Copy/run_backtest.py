@@ -1,10 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import functools
 import importlib
 import os
 import sys
+import threading
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from backtest import calculate_monthly_returns
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
@@ -14,6 +20,17 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import the backtest module
 import backtest
 
+@functools.lru_cache(maxsize=1)
+def _strategy_names():
+    """Names of the strategy modules in strategies/, scanned once per process."""
+    strategies_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategies")
+    with os.scandir(strategies_dir) as entries:
+        # Modules starting with "_" (e.g. __init__.py, _loops.py) are helpers, not strategies
+        return tuple(sorted(
+            e.name[:-3] for e in entries
+            if e.is_file() and e.name.endswith(".py") and not e.name.startswith("_")
+        ))
+
 class BacktestApp:
     def __init__(self, root):
         self.root = root
@@ -39,8 +56,8 @@ class BacktestApp:
         strategy_combo = ttk.Combobox(input_frame, textvariable=self.strategy_var, values=self.strategies, width=15)
         strategy_combo.grid(row=0, column=3, sticky=tk.W, pady=5)
 
-        run_button = ttk.Button(input_frame, text="Run Backtest", command=self.run_backtest)
-        run_button.grid(row=0, column=4, sticky=tk.E, padx=(20, 0), pady=5)
+        self.run_button = ttk.Button(input_frame, text="Run Backtest", command=self.run_backtest)
+        self.run_button.grid(row=0, column=4, sticky=tk.E, padx=(20, 0), pady=5)
 
         self.results_frame = ttk.LabelFrame(main_frame, text="Results", padding="10")
         self.results_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -48,24 +65,89 @@ class BacktestApp:
         self.metrics_frame = ttk.Frame(self.results_frame)
         self.metrics_frame.pack(fill=tk.X, pady=5)
 
+        # One table for the metrics and fixed export buttons, reused by every run
+        self.metrics_box = ttk.LabelFrame(self.metrics_frame, text="Performance")
+        self.metrics_box.pack(fill=tk.X, pady=5)
+        self.metrics_box.columnconfigure(0, weight=1)
+
+        # Tall enough for all 11 metrics from calculate_metrics, so none are hidden by default
+        self.metrics_tree = ttk.Treeview(self.metrics_box, columns=('value',), show='tree headings', height=11)
+        self.metrics_tree.heading('#0', text='Metric')
+        self.metrics_tree.heading('value', text='Value')
+        self.metrics_tree.grid(row=0, column=0, columnspan=2, sticky=tk.EW, padx=5, pady=2)
+        metrics_scroll = ttk.Scrollbar(self.metrics_box, orient=tk.VERTICAL, command=self.metrics_tree.yview)
+        metrics_scroll.grid(row=0, column=2, sticky=tk.NS, pady=2)
+        self.metrics_tree.configure(yscrollcommand=metrics_scroll.set)
+
+        self.export_button = ttk.Button(self.metrics_box, text="Export Trades", state=tk.DISABLED)
+        self.export_button.grid(row=1, column=0, pady=10, sticky=tk.W)
+        self.export_monthly_button = ttk.Button(self.metrics_box, text="Export Monthly Returns to CSV", state=tk.DISABLED)
+        self.export_monthly_button.grid(row=1, column=1, pady=10, sticky=tk.W)
+
         self.plot_frame = ttk.Frame(self.results_frame)
         self.plot_frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
+        # The figure and its artists are built once; display_results only swaps in new data
+        # dpi matches the usual Tk screen resolution so the canvas bitmap isn't resampled
+        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(8, 6), dpi=96)
+        # The long series are drawn as one bitmap (this also keeps toolbar PDF/SVG saves light)
+        self.equity_line, = self.ax1.plot([], [], label="Equity Curve", linewidth=2, rasterized=True)
+        self.buy_markers, = self.ax1.plot([], [], linestyle='none', marker='^', color='green', markersize=11, label='Buy')
+        self.sell_markers, = self.ax1.plot([], [], linestyle='none', marker='v', color='red', markersize=11, label='Sell')
+        self.dd_fill = None
+        self._dates = self._equity = None
+
+        self.ax1.set_ylabel("Equity ($)")
+        self.ax1.grid(True)
+        self.ax1.legend()
+        self.ax1.xaxis_date()
+
+        self.ax2.set_title("Drawdown")
+        self.ax2.set_xlabel("Date")
+        self.ax2.set_ylabel("Drawdown")
+        self.ax2.grid(True)
+        self.ax2.xaxis_date()
+        # Fixed margins set once, instead of running the tight_layout solver on every run
+        self.fig.subplots_adjust(left=0.1, right=0.95, bottom=0.1, top=0.92, hspace=0.35)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        toolbar_frame = ttk.Frame(self.plot_frame)
+        toolbar_frame.pack(fill=tk.X)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame)
+        self.toolbar.update()
+
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, side=tk.BOTTOM, pady=2)
 
-    def get_available_strategies(self):
-        strategies_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategies")
-        strategies = []
-        for file in os.listdir(strategies_dir):
-            if file.endswith(".py") and file != "__init__.py":
-                strategies.append(os.path.splitext(file)[0])
-        return sorted(strategies)
+        # Import the strategies and compile the numba kernels while the window opens
+        threading.Thread(target=self._warmup, daemon=True).start()
 
-    def clear_frame(self, frame):
-        for widget in frame.winfo_children():
-            widget.destroy()
+    def get_available_strategies(self):
+        return list(_strategy_names())
+
+    def _warmup(self):
+        """Run every strategy once on a small synthetic price series so the first click is fast."""
+        rng = np.random.default_rng(0)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 256))
+        df = pd.DataFrame(
+            {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(256, 1e6)},
+            index=pd.bdate_range("2000-01-03", periods=256),
+        )
+        for name in self.strategies:
+            try:
+                strategy_df = backtest._load_strategy(name).generate_signals(df)
+                # The same kernel call calculate_metrics makes on a strategy's output
+                backtest._backtest_loop(
+                    strategy_df["Close"].to_numpy(dtype=np.float64),
+                    strategy_df["Signal"].to_numpy(dtype=np.int8),
+                    1.0,
+                )
+            except Exception:
+                # Best effort only; a broken strategy reports its error when it is actually run
+                pass
 
     def run_backtest(self):
         ticker = self.ticker_var.get().strip().upper()
@@ -79,27 +161,70 @@ class BacktestApp:
             messagebox.showerror("Error", "Please select a strategy")
             return
 
+        # The backtest runs in a worker thread so the window stays responsive;
+        # the button stays disabled until its result is back
+        self.run_button.configure(state=tk.DISABLED)
         self.status_var.set(f"Running backtest for {ticker} with {strategy}...")
-        self.root.update()
+        self.root.update_idletasks()
+        threading.Thread(target=self._run_in_background, args=(ticker, strategy), daemon=True).start()
+
+    def _run_in_background(self, ticker, strategy):
+        # Only plain computation happens here; all widget updates go through root.after
+        try:
+            result = backtest.main(ticker, strategy, plot=False)
+        except Exception as e:
+            self.root.after(0, self._backtest_failed, e)
+        else:
+            self.root.after(0, self._backtest_done, result, ticker, strategy)
 
+    def _backtest_done(self, result, ticker, strategy):
+        self.run_button.configure(state=tk.NORMAL)
         try:
-            result = backtest.main(ticker, strategy)
             self.display_results(result, ticker, strategy)
             self.status_var.set(f"Backtest completed for {ticker} with {strategy}")
         except Exception as e:
-            messagebox.showerror("Error", f"Error running backtest: {str(e)}")
-            self.status_var.set("Error running backtest")
+            self._backtest_failed(e)
+
+    def _backtest_failed(self, error):
+        self.run_button.configure(state=tk.NORMAL)
+        self.clear_plot()
+        messagebox.showerror("Error", f"Error running backtest: {str(error)}")
+        self.status_var.set("Error running backtest")
 
     def export_trades_to_csv(self, trades_df, ticker, strategy):
         if trades_df is None or trades_df.empty:
             messagebox.showinfo("Export", "No trades to export")
             return
-        if 'Profit %' not in trades_df.columns:
-            trades_df['Profit %'] = (trades_df['Exit Price'] - trades_df['Entry Price']) / trades_df['Entry Price'] * 100
-        export_df = trades_df[['Entry Date', 'Exit Date', 'Profit %']]
-        filename = f"{ticker}_{strategy}_trades.csv"
-        save_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
-        export_df.to_csv(save_path, index=False)
+        if 'Profit %' in trades_df.columns:
+            profit_pct = trades_df['Profit %'].to_numpy()
+        else:
+            # Work on the raw arrays and leave trades_df itself untouched
+            entry = trades_df['Entry Price'].to_numpy(dtype=np.float64)
+            exit_ = trades_df['Exit Price'].to_numpy(dtype=np.float64)
+            profit_pct = (exit_ - entry) * (100.0 / entry)
+        entry_dates = trades_df['Entry Date'].to_numpy()
+        exit_dates = trades_df['Exit Date'].to_numpy()
+
+        # CSV stays the default; picking .parquet in the dialog writes a Parquet file instead
+        save_path = filedialog.asksaveasfilename(
+            initialdir=os.path.dirname(os.path.abspath(__file__)),
+            initialfile=f"{ticker}_{strategy}_trades.csv",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Parquet", "*.parquet")],
+        )
+        if not save_path:
+            return
+        if save_path.lower().endswith(".parquet"):
+            # Straight from the NumPy arrays to an Arrow table, no DataFrame in between
+            table = pa.table({
+                'Entry Date': pa.array(entry_dates),
+                'Exit Date': pa.array(exit_dates),
+                'Profit %': pa.array(profit_pct),
+            })
+            pq.write_table(table, save_path)
+        else:
+            export_df = pd.DataFrame({'Entry Date': entry_dates, 'Exit Date': exit_dates, 'Profit %': profit_pct})
+            export_df.to_csv(save_path, index=False)
         messagebox.showinfo("Export", f"Trades exported to {save_path}")
         return save_path
 
@@ -111,103 +236,88 @@ class BacktestApp:
         messagebox.showinfo("Export", f"Monthly returns exported to {save_path}")
         return save_path
 
-    def display_results(self, result, ticker, strategy):
-        self.clear_frame(self.metrics_frame)
-        self.clear_frame(self.plot_frame)
+    def clear_plot(self):
+        """Empty the persistent figure so no earlier run stays on screen."""
+        self.equity_line.set_data([], [])
+        self.buy_markers.set_data([], [])
+        self.sell_markers.set_data([], [])
+        if self.dd_fill is not None:
+            self.dd_fill.remove()
+            self.dd_fill = None
+        self._dates = self._equity = None
+        self.ax1.set_title("")
+        self.canvas.draw_idle()
 
-        if not result or (isinstance(result, tuple) and len(result) >= 2 and result[1] is not None and result[1].empty):
-            ttk.Label(self.metrics_frame, text="No trades executed").pack(pady=10)
+    def display_results(self, result, ticker, strategy):
+        self.metrics_tree.delete(*self.metrics_tree.get_children())
+
+        # backtest.main returns (None, None, strategy_df) when no trades were executed
+        if not result or result[0] is None or (isinstance(result, tuple) and len(result) >= 2 and result[1] is not None and result[1].empty):
+            self.metrics_box.configure(text="Performance")
+            self.metrics_tree.insert('', 'end', text="No trades executed", values=("",))
+            self.export_button.configure(state=tk.DISABLED)
+            self.export_monthly_button.configure(state=tk.DISABLED)
+            self.clear_plot()
             return
 
         metrics, trades_df, strategy_df = result
+        # Parse the bar dates once (string/object dates included) for both the x axis and the
+        # trade lookups; strategy_df itself is left as it is for the export buttons
+        bar_dates = pd.DatetimeIndex(pd.to_datetime(strategy_df["Date"], cache=True))
 
-        metrics_frame = ttk.LabelFrame(self.metrics_frame, text=f"{ticker} - {strategy} Performance")
-        metrics_frame.pack(fill=tk.X, pady=5)
-
-        row, col = 0, 0
+        self.metrics_box.configure(text=f"{ticker} - {strategy} Performance")
         for metric, value in metrics.items():
-            ttk.Label(metrics_frame, text=f"{metric}:", font=("", 10, "bold")).grid(row=row, column=col*2, sticky=tk.W, padx=5, pady=2)
-            ttk.Label(metrics_frame, text=value).grid(row=row, column=col*2+1, sticky=tk.W, padx=5, pady=2)
-            col += 1
-            if col > 2:
-                col = 0
-                row += 1
-
-        export_button = ttk.Button(metrics_frame, text="Export Trades to CSV", command=lambda: self.export_trades_to_csv(trades_df, ticker, strategy))
-        export_button.grid(row=row+1, column=0, columnspan=2, pady=10, sticky=tk.W)
+            self.metrics_tree.insert('', 'end', text=metric, values=(value,))
 
-        export_monthly_button = ttk.Button(metrics_frame, text="Export Monthly Returns to CSV", command=lambda: self.export_monthly_returns_to_csv(strategy_df, ticker, strategy))
-        export_monthly_button.grid(row=row+1, column=2, columnspan=2, pady=10, sticky=tk.W)
+        self.export_button.configure(state=tk.NORMAL, command=lambda: self.export_trades_to_csv(trades_df, ticker, strategy))
+        self.export_monthly_button.configure(state=tk.NORMAL, command=lambda: self.export_monthly_returns_to_csv(strategy_df, ticker, strategy))
 
-        fig = plt.figure(figsize=(8, 6))
-        ax1 = fig.add_subplot(2, 1, 1)
-        ax1.plot(strategy_df["Date"], strategy_df["EquityCurve"], label="Equity Curve", linewidth=2)
+        # The plotted series are kept as plain float64 arrays (matplotlib date numbers for
+        # the x axis) and handed to the artists as-is, without further conversion
+        self._dates = mdates.date2num(bar_dates.to_numpy())
+        self._equity = np.ascontiguousarray(strategy_df["EquityCurve"].to_numpy(), dtype=np.float64)
+        self.equity_line.set_data(self._dates, self._equity)
 
         if trades_df is not None and not trades_df.empty:
             if isinstance(trades_df, pd.Series):
                 trades_df = pd.DataFrame([trades_df])
-            entry_dates = trades_df['Entry Date'].values
-            entry_points = []
-            exit_dates = trades_df['Exit Date'].values
-            exit_points = []
-
-            for date in entry_dates:
-                mask = strategy_df['Date'] == date
-                if any(mask):
-                    idx = mask.idxmax()
-                    entry_points.append((date, strategy_df.loc[idx, 'EquityCurve']))
-
-            for date in exit_dates:
-                mask = strategy_df['Date'] == date
-                if any(mask):
-                    idx = mask.idxmax()
-                    exit_points.append((date, strategy_df.loc[idx, 'EquityCurve']))
-
-            if entry_points:
-                entries_df = pd.DataFrame(entry_points, columns=['Date', 'EquityCurve'])
-                ax1.scatter(entries_df['Date'], entries_df['EquityCurve'], marker='^', color='green', s=120, label='Buy')
-            if exit_points:
-                exits_df = pd.DataFrame(exit_points, columns=['Date', 'EquityCurve'])
-                ax1.scatter(exits_df['Date'], exits_df['EquityCurve'], marker='v', color='red', s=120, label='Sell')
+            # Hash-probe all entry and exit dates against the bar dates in one batch
+            # (entries first, then exits); -1 means no matching bar
+            trade_dates = trades_df[['Entry Date', 'Exit Date']].to_numpy().ravel(order='F')
+            trade_idx = bar_dates.get_indexer(pd.to_datetime(trade_dates, cache=True))
+            entry_idx, exit_idx = np.split(trade_idx, 2)
+            entry_idx = entry_idx[entry_idx >= 0]
+            exit_idx = exit_idx[exit_idx >= 0]
+            self.buy_markers.set_data(self._dates[entry_idx], self._equity[entry_idx])
+            self.sell_markers.set_data(self._dates[exit_idx], self._equity[exit_idx])
         else:
-            buys = strategy_df[strategy_df['Signal'] == 1]
-            sells = strategy_df[strategy_df['Signal'] == -1]
-            if not buys.empty:
-                ax1.scatter(buys['Date'], buys['EquityCurve'], marker='^', color='green', s=120, label='Buy')
-            if not sells.empty:
-                ax1.scatter(sells['Date'], sells['EquityCurve'], marker='v', color='red', s=120, label='Sell')
-
-        ax1.set_title(f"{ticker} - {strategy} Equity Curve")
-        ax1.set_ylabel("Equity ($)")
-        ax1.grid(True)
-
-        handles = [
-            plt.Line2D([0], [0], color='blue', linewidth=2),
-            plt.Line2D([0], [0], marker='^', color='w', markerfacecolor='green', markersize=10),
-            plt.Line2D([0], [0], marker='v', color='w', markerfacecolor='red', markersize=10)
-        ]
-        labels = ['Equity Curve', 'Buy', 'Sell']
-        ax1.legend(handles, labels)
-
-        ax2 = fig.add_subplot(2, 1, 2)
-        strategy_df["Peak"] = strategy_df["EquityCurve"].cummax()
-        strategy_df["Drawdown"] = (strategy_df["EquityCurve"] - strategy_df["Peak"]) / strategy_df["Peak"]
-        ax2.fill_between(strategy_df["Date"], strategy_df["Drawdown"], 0, color="red", alpha=0.3)
-        ax2.set_title("Drawdown")
-        ax2.set_xlabel("Date")
-        ax2.set_ylabel("Drawdown")
-        ax2.grid(True)
-
-        plt.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        toolbar_frame = ttk.Frame(self.plot_frame)
-        toolbar_frame.pack(fill=tk.X)
-        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-        toolbar.update()
+            signal = strategy_df['Signal'].to_numpy()
+            buys = signal == 1
+            sells = signal == -1
+            self.buy_markers.set_data(self._dates[buys], self._equity[buys])
+            self.sell_markers.set_data(self._dates[sells], self._equity[sells])
+
+        self.ax1.set_title(f"{ticker} - {strategy} Equity Curve")
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+
+        # backtest.calculate_metrics normally added the Drawdown column already;
+        # otherwise compute it on the raw array without writing back to strategy_df
+        if "Drawdown" in strategy_df.columns:
+            drawdown = strategy_df["Drawdown"].to_numpy()
+        else:
+            # (equity - peak) / peak, reusing the peak buffer for the result
+            drawdown = np.maximum.accumulate(self._equity)
+            np.divide(self._equity, drawdown, out=drawdown)
+            drawdown -= 1
+        if self.dd_fill is not None:
+            self.dd_fill.remove()
+        # Let the new fill alone set the drawdown axis limits
+        self.ax2.ignore_existing_data_limits = True
+        self.dd_fill = self.ax2.fill_between(self._dates, drawdown, 0, color="red", alpha=0.3, rasterized=True)
+        self.ax2.autoscale_view()
+
+        self.canvas.draw_idle()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from strategies._njit import njit
+
+
+@njit(cache=True)
+def _signal_loop(buy, sell):
+    """
+    Turn raw buy/sell conditions into a clean alternating signal array.
+    A buy is only taken when flat and a sell only when in a position.
+    Returns an int8 array with 1=Buy, -1=Sell, 0=Hold.
+    """
+    sig = np.zeros(len(buy), np.int8)
+    in_pos = False
+    for i in range(len(buy)):
+        if not in_pos and buy[i]:
+            sig[i] = 1
+            in_pos = True
+        elif in_pos and sell[i]:
+            sig[i] = -1
+            in_pos = False
+    return sig
+
+
+@njit(cache=True)
+def _backtest_loop(close, signal, start_equity):
+    """
+    Walk the bars once, returning the equity curve and the entry/exit bar of
+    every closed trade. A buy is taken when flat and the next sell closes it;
+    the trade's return is applied to the equity on the bar after the sell.
+    """
+    n = len(close)
+    # Compound in float64, store as float32: half the memory for every later pass
+    # over the curve, and float32's ~1e-7 relative error is far below what matters
+    equity = np.empty(n, np.float32)
+    entries = np.empty(n, np.int64)
+    exits = np.empty(n, np.int64)
+    n_trades = 0
+    eq = start_equity
+    in_pos = False
+    entry = 0
+    for i in range(n):
+        equity[i] = eq
+        if signal[i] == 1 and not in_pos:
+            in_pos = True
+            entry = i
+        elif signal[i] == -1 and in_pos:
+            in_pos = False
+            eq *= 1 + (close[i] - close[entry]) / close[entry]
+            entries[n_trades] = entry
+            exits[n_trades] = i
+            n_trades += 1
+    return equity, entries[:n_trades], exits[:n_trades]
@@ -0,0 +1,15 @@
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """
+        Fallback used when numba is not installed: return the function unchanged
+        so the strategies still import and run as plain Python.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,32 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _rolling(values, window, reduce):
+    """
+    Apply reduce over every full window of values in one vectorized call.
+    Like pandas rolling, the first window - 1 entries are NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = reduce(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def rolling_max(values, window):
+    return _rolling(values, window, np.max)
+
+
+def rolling_min(values, window):
+    return _rolling(values, window, np.min)
+
+
+def rolling_mean(values, window):
+    return _rolling(values, window, np.mean)
+
+
+def shift(values, periods=1):
+    """Shift values forward by periods bars, filling the start with NaN."""
+    out = np.full(len(values), np.nan)
+    out[periods:] = values[:len(values) - periods]
+    return out
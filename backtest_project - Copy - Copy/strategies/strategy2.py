@@ -1,73 +1,42 @@
 import pandas as pd
 import numpy as np
 
-def generate_signals(df):
+from strategies._loops import _backtest_loop, _signal_loop
+from strategies._rolling import shift
+from utils.arrays import to_arrays
+
+def generate_signals(df, arrs=None):
     """
     Generate trading signals based on day of week and recent price action.
+    arrs is an optional utils.arrays.ArraySet of df's columns (built from df if omitted).
     Returns DataFrame with Date, Close, Signal (1=Buy, -1=Sell, 0=Hold), and EquityCurve columns.
     """
-    # Make a copy to avoid modifying the original
-    df = df.copy()
-    
-    # Ensure we're working with a proper DatetimeIndex
-    if not isinstance(df.index, pd.DatetimeIndex):
-        df.index = pd.to_datetime(df.index)
+    # Work on plain NumPy arrays; backtest.main passes them in, otherwise
+    # pull them out of df here (df itself is never modified)
+    if arrs is None:
+        arrs = to_arrays(df)
+    high, low, close = arrs.high, arrs.low, arrs.close
     
     # Calculate indicators
-    df["Weekday"] = df.index.dayofweek  # Use dayofweek from DatetimeIndex
-    df["Down_2_Days"] = (df["Close"] < df["Close"].shift(1)) & (df["Close"].shift(1) < df["Close"].shift(2))
+    weekday = pd.DatetimeIndex(arrs.date).dayofweek
+    prev_close = shift(close)
+    down_2_days = (close < prev_close) & (prev_close < shift(close, 2))
     
-    # Drop NaN values and create a fresh copy to avoid alignment issues
-    df = df.dropna().copy()
-
     # Define Buy & Sell conditions
-    buy_condition = (df["Weekday"] == 0) & df["Down_2_Days"]
-    sell_condition = df["Close"] > df["High"].shift(1)
+    buy_condition = (weekday == 0) & down_2_days
+    sell_condition = close > shift(high)
     
-    # Initialize Signal column with zeros
-    df["Signal"] = 0
+    # No warm-up rows to skip: on the first bars the shifted comparisons are just False
+    start = 0
     
     # Implement strict position tracking to ensure we get a clean buy/sell pattern
-    in_position = False
-    
-    # Process one bar at a time and set signals
-    for i in range(len(df)):
-        # Only consider a buy if we're not in a position and buy condition is met
-        if not in_position and buy_condition.iloc[i]:
-            df.iloc[i, df.columns.get_loc("Signal")] = 1  # Signal a buy
-            in_position = True
-        # Only consider a sell if we are in a position and sell condition is met
-        elif in_position and sell_condition.iloc[i]:
-            df.iloc[i, df.columns.get_loc("Signal")] = -1  # Signal a sell
-            in_position = False
-        # All other cases get a zero signal
-        else:
-            df.iloc[i, df.columns.get_loc("Signal")] = 0
-    
-    # Calculate equity curve (starting with $1)
-    df["EquityCurve"] = 1.0
-    in_position = False
-    entry_price = 0
-    
-    for i in range(1, len(df)):
-        # Check for buy signal
-        if df["Signal"].iloc[i-1] == 1:
-            in_position = True
-            entry_price = df["Close"].iloc[i-1]
-            df.iloc[i, df.columns.get_loc("EquityCurve")] = df["EquityCurve"].iloc[i-1]
-        # Check for sell signal
-        elif df["Signal"].iloc[i-1] == -1 and in_position:
-            in_position = False
-            exit_price = df["Close"].iloc[i-1]
-            pct_change = (exit_price - entry_price) / entry_price
-            df.iloc[i, df.columns.get_loc("EquityCurve")] = df["EquityCurve"].iloc[i-1] * (1 + pct_change)
-        # No signal or already in position
-        else:
-            df.iloc[i, df.columns.get_loc("EquityCurve")] = df["EquityCurve"].iloc[i-1]
-    
-    # Ensure we have a Date column (from index)
-    df = df.reset_index()
-    df = df.rename(columns={"index": "Date"})
-    
-    # Return only required columns
-    return df[["Date", "Close", "Signal", "EquityCurve"]]
+    close = close[start:]
+    signal = _signal_loop(buy_condition[start:], sell_condition[start:])
+    
+    # Build the result straight from the arrays
+    return pd.DataFrame({
+        "Date": arrs.date[start:],
+        "Close": close,
+        "Signal": signal,
+        "EquityCurve": _backtest_loop(close, signal, 1.0)[0],  # starting with $1
+    })
@@ -0,0 +1,21 @@
+from collections import namedtuple
+import pandas as pd
+
+# The OHLCV columns and dates of a price frame as plain NumPy arrays
+ArraySet = namedtuple("ArraySet", "open high low close volume date")
+
+def to_arrays(df):
+    """
+    Extract the OHLCV columns and the datetime index of a price DataFrame
+    (as returned by get_data) as NumPy arrays.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with Open, High, Low, Close, Volume columns
+        
+    Returns:
+        ArraySet: namedtuple with open, high, low, close, volume and date arrays
+    """
+    return ArraySet(
+        *(df[col].to_numpy() for col in ("Open", "High", "Low", "Close", "Volume")),
+        pd.to_datetime(df.index).to_numpy(),
+    )
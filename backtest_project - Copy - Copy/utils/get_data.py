@@ -1,13 +1,20 @@
+import os
+import tempfile
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-def get_data(ticker):
+# Downloads are cached here as one parquet file per ticker per day
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+def get_data(ticker, use_cache=True):
     """
     Downloads historical stock data for the given ticker using yfinance.
     
     Args:
         ticker (str): Stock ticker symbol (e.g., 'SPY', 'AAPL')
+        use_cache (bool): Reuse today's download of the ticker from the data
+            directory if there is one; otherwise download and refresh the cache
         
     Returns:
         pd.DataFrame: DataFrame with OHLCV data and datetime index
@@ -15,6 +22,17 @@ def get_data(ticker):
     Raises:
         ValueError: If ticker is invalid or data cannot be downloaded
     """
+    cache_path = os.path.join(CACHE_DIR, f"{ticker}_{date.today()}.parquet")
+    if use_cache and os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except (OSError, ValueError):
+            # Unreadable cache file: delete it and download fresh data below
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+    
     try:
         # Download 20 years of daily data
         end_date = datetime.now()
@@ -56,6 +74,20 @@ def get_data(ticker):
         # Ensure index is datetime
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
+        
+        # Save for the next run today; if the cache can't be written, just skip it.
+        # Write to a temp file and rename it into place, so a half-written file
+        # is never left under the cache name.
+        tmp_path = None
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".parquet.tmp")
+            os.close(fd)
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             
         return df
         